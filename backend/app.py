@@ -1,8 +1,18 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import os
+import json
+import time
 import logging
 from datetime import datetime
+from functools import cached_property
+
+from json_provider import ORJSONProvider, HAS_ORJSON
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
 
 # Import routes
 from routes.documents import documents_bp
@@ -11,17 +21,58 @@ from routes.assignments import assignments_bp
 from routes.study_plan import study_plan_bp
 from routes.ai_chat import ai_chat_bp
 
-# Import services
-from services.document_processor import DocumentProcessor
-from services.ai_service import AIService
-from services.study_planner import StudyPlanner
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds to reuse the last AI connection check in the health endpoint
+HEALTH_CHECK_TTL = 2.0
+
+# Health check body with slots for the timestamp and the JSON-encoded AI status
+HEALTH_TEMPLATE = (
+    b'{"status":"healthy","timestamp":"%s","services":{'
+    b'"document_processor":"online","ai_service":%s,"study_planner":"online"}}'
+)
+
+# Size caps for JSON request bodies, checked in order by path prefix.
+# File uploads are multipart and only bounded by MAX_CONTENT_LENGTH.
+JSON_BODY_LIMITS = (
+    ('/api/ai/chat', 64 * 1024),
+    ('/api/', 1024 * 1024),
+)
+
+class StudyCompanionApp(Flask):
+    """Flask app that builds its services on first use.
+    
+    Routes reach the services through current_app, so deferring the imports
+    and construction keeps them off the cold-start path.
+    """
+    
+    @cached_property
+    def document_processor(self):
+        from services.document_processor import DocumentProcessor
+        return DocumentProcessor()
+    
+    @cached_property
+    def ai_service(self):
+        from services.ai_service import AIService
+        return AIService()
+    
+    @cached_property
+    def study_planner(self):
+        from services.study_planner import StudyPlanner
+        return StudyPlanner()
+
 def create_app():
-    app = Flask(__name__)
+    app = StudyCompanionApp(__name__)
+    
+    # Encode and decode JSON with orjson when it is installed
+    if HAS_ORJSON:
+        app.json = ORJSONProvider(app)
+    
+    # Compact, unsorted JSON: no pretty-print whitespace or key sort on every response
+    app.json.compact = True
+    app.json.sort_keys = False
     
     # Disable automatic .env loading to avoid encoding issues
     app.config['LOAD_DOTENV'] = False
@@ -33,20 +84,16 @@ def create_app():
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'lightweight-study-app-secret')
     app.config['UPLOAD_FOLDER'] = os.path.join(os.getcwd(), 'uploads')
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 1024  # Small bodies aren't worth compressing
+    
+    # Compress large JSON responses (document lists, extracted text) when Flask-Compress is installed
+    if Compress is not None:
+        Compress(app)
     
     # Create upload directory if it doesn't exist
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
-    # Initialize services
-    document_processor = DocumentProcessor()
-    ai_service = AIService()
-    study_planner = StudyPlanner()
-    
-    # Store services in app context for access in routes
-    app.document_processor = document_processor
-    app.ai_service = ai_service
-    app.study_planner = study_planner
-    
     # Register blueprints
     app.register_blueprint(documents_bp, url_prefix='/api/documents')
     app.register_blueprint(units_bp, url_prefix='/api/units')
@@ -54,18 +101,41 @@ def create_app():
     app.register_blueprint(study_plan_bp, url_prefix='/api/study-plans')
     app.register_blueprint(ai_chat_bp, url_prefix='/api/ai')
     
+    # Reject oversized JSON bodies before any route parses them
+    @app.before_request
+    def limit_json_body():
+        if not request.is_json or request.content_length is None:
+            return None
+        for prefix, limit in JSON_BODY_LIMITS:
+            if request.path.startswith(prefix):
+                if request.content_length > limit:
+                    return jsonify({'error': 'Payload too large', 'message': f'JSON body exceeds limit of {limit} bytes'}), 413
+                return None
+        return None
+    
+    # Tag JSON GET responses so polling clients get a bodiless 304 when nothing changed.
+    # The tag is weak so it stays valid across content encodings and the 304 is decided before compression.
+    @app.after_request
+    def add_etag(response):
+        if (request.method == 'GET' and response.status_code == 200
+                and response.mimetype == 'application/json' and not response.is_streamed):
+            response.add_etag(weak=True)
+            response.make_conditional(request)
+        return response
+    
     # Health check endpoint
+    # Cache the encoded AI connection status briefly so frequent polling doesn't hit Ollama every time
+    last_check = {'at': float('-inf'), 'status': b'null'}
+    
     @app.route('/api/health', methods=['GET'])
     def health_check():
-        return jsonify({
-            'status': 'healthy',
-            'timestamp': datetime.now().isoformat(),
-            'services': {
-                'document_processor': 'online',
-                'ai_service': ai_service.check_connection(),
-                'study_planner': 'online'
-            }
-        })
+        now = time.monotonic()
+        if now - last_check['at'] >= HEALTH_CHECK_TTL:
+            last_check['status'] = json.dumps(app.ai_service.check_connection()).encode()
+            last_check['at'] = now
+        
+        timestamp = datetime.now().replace(microsecond=0).isoformat().encode()
+        return Response(HEALTH_TEMPLATE % (timestamp, last_check['status']), mimetype='application/json')
     
     # Error handlers
     @app.errorhandler(400)
@@ -78,7 +148,7 @@ def create_app():
     
     @app.errorhandler(500)
     def internal_error(error):
-        logger.error(f"Internal error: {error}")
+        logger.error("Internal error: %s", error)
         return jsonify({'error': 'Internal server error', 'message': 'An unexpected error occurred'}), 500
     
     @app.errorhandler(413)
@@ -88,16 +158,20 @@ def create_app():
     return app
 
 if __name__ == '__main__':
+    # Development entry point. For concurrent AI requests run the app under a
+    # WSGI server instead, see wsgi.py.
     app = create_app()
     
     # Get port from environment variable or default to 8000
     port = int(os.environ.get('PORT', 8000))
     
-    logger.info(f"Starting StudyCompanion backend on port {port}")
-    logger.info(f"Upload folder: {app.config['UPLOAD_FOLDER']}")
+    logger.info("Starting StudyCompanion backend on port %s", port)
+    logger.info("Upload folder: %s", app.config['UPLOAD_FOLDER'])
     
     app.run(
         host='0.0.0.0',
         port=port,
-        debug=False  # Disable debug mode to avoid .env loading issues
+        debug=False,  # Disable debug mode to avoid .env loading issues
+        threaded=True,
+        use_reloader=False
     )
@@ -0,0 +1,12 @@
+"""WSGI entry point for running the backend under a production server.
+
+The Werkzeug server started by ``app.py`` handles one request at a time, so a
+single slow Ollama round-trip stalls every other request. The AI endpoints are
+I/O-bound, so a threaded worker pool multiplies throughput directly:
+
+    cd backend
+    gunicorn -k gthread --threads 32 -w 2 -b 0.0.0.0:8000 wsgi:application
+"""
+from app import create_app
+
+application = create_app()
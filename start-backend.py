@@ -20,8 +20,19 @@ if __name__ == '__main__':
     print(f"Starting StudyCompanion backend on port {port}")
     print(f"Upload folder: {app.config['UPLOAD_FOLDER']}")
     
-    app.run(
-        host='0.0.0.0',
-        port=port,
-        debug=False
-    )
+    # Prefer waitress's persistent worker threads over the Werkzeug dev server
+    try:
+        from waitress import serve
+    except ImportError:
+        serve = None
+    
+    if serve is not None:
+        serve(app, host='0.0.0.0', port=port, threads=8)
+    else:
+        app.run(
+            host='0.0.0.0',
+            port=port,
+            debug=False,
+            threaded=True,
+            use_reloader=False
+        )